@@ -1,5 +1,6 @@
 import { NextRequest } from 'next/server';
 import { getConversationManager } from '@/lib/server/global-state';
+import { encodeSseEvent } from '@/lib/server/sse';
 
 interface ChatRequest {
   message: string;
@@ -19,24 +20,20 @@ export async function POST(request: NextRequest) {
     const body: ChatRequest = await request.json();
 
     // Create a readable stream for SSE
-    const encoder = new TextEncoder();
     const stream = new ReadableStream({
       async start(controller) {
         try {
           for await (const event of conversationManager.sendMessageStreaming(body.message)) {
             // Format as SSE
-            const eventData = JSON.stringify(event);
-            const sseData = `data: ${eventData}\n\n`;
-            controller.enqueue(encoder.encode(sseData));
+            controller.enqueue(encodeSseEvent(event));
           }
           controller.close();
         } catch (error: any) {
           console.error('Error in chat stream:', error);
-          const errorEvent = JSON.stringify({
+          controller.enqueue(encodeSseEvent({
             type: 'error',
             data: { message: error.message }
-          });
-          controller.enqueue(encoder.encode(`data: ${errorEvent}\n\n`));
+          }));
           controller.close();
         }
       }
@@ -11,7 +11,7 @@ export async function DELETE() {
     );
   }
 
-  const result = conversationManager.clearMemories();
+  const result = await conversationManager.clearMemories();
 
   return NextResponse.json({ message: result });
 }
@@ -0,0 +1,59 @@
+import { NextResponse } from 'next/server';
+import { getConversationManager } from '@/lib/server/global-state';
+import { encodeSseEvent } from '@/lib/server/sse';
+
+/**
+ * SSE endpoint that streams memory file contents, one event per file
+ * Files are read as the client consumes the stream, so large memory stores
+ * are never buffered into a single response
+ */
+export async function GET() {
+  const conversationManager = getConversationManager();
+
+  if (!conversationManager) {
+    return NextResponse.json(
+      { detail: 'Session not initialized' },
+      { status: 400 }
+    );
+  }
+
+  const files = conversationManager.iterMemoryContents();
+  let count = 0;
+
+  // Pull-based stream: the next file is only read when the client is ready for it
+  const stream = new ReadableStream({
+    async pull(controller) {
+      try {
+        const { value, done } = await files.next();
+
+        if (done) {
+          controller.enqueue(encodeSseEvent({ type: 'done', data: { count } }));
+          controller.close();
+          return;
+        }
+
+        count++;
+        controller.enqueue(encodeSseEvent({ type: 'memory_file', data: value }));
+      } catch (error: any) {
+        console.error('Error streaming memory contents:', error);
+        controller.enqueue(encodeSseEvent({
+          type: 'error',
+          data: { message: error.message }
+        }));
+        controller.close();
+      }
+    },
+    async cancel() {
+      // Client disconnected - stop walking the memory directory
+      await files.return(undefined);
+    }
+  });
+
+  return new Response(stream, {
+    headers: {
+      'Content-Type': 'text/event-stream',
+      'Cache-Control': 'no-cache',
+      'Connection': 'keep-alive',
+    }
+  });
+}
@@ -1,11 +1,9 @@
 import { NextResponse } from 'next/server';
-import Anthropic from '@anthropic-ai/sdk';
+import { getAnthropicClient } from '@/lib/server/anthropic-client';
 
 export async function GET() {
     try {
-        const anthropic = new Anthropic({
-            apiKey: process.env.ANTHROPIC_API_KEY,
-        });
+        const anthropic = getAnthropicClient(process.env.ANTHROPIC_API_KEY);
 
         const models = await anthropic.models.list();
 
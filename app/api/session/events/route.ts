@@ -1,5 +1,6 @@
 import { NextRequest } from 'next/server';
 import { onSessionChange } from '@/lib/server/global-state';
+import { encodeSseEvent, SSE_KEEPALIVE } from '@/lib/server/sse';
 
 /**
  * SSE endpoint that streams session change events
@@ -7,8 +8,6 @@ import { onSessionChange } from '@/lib/server/global-state';
  * when the session ID changes (on init or memory clear)
  */
 export async function GET(request: NextRequest) {
-  const encoder = new TextEncoder();
-
   // Create a ReadableStream for SSE
   const stream = new ReadableStream({
     start(controller) {
@@ -16,9 +15,9 @@ export async function GET(request: NextRequest) {
       let keepAliveInterval: NodeJS.Timeout | null = null;
 
       // Helper to safely enqueue data
-      const safeEnqueue = (data: string) => {
+      const safeEnqueue = (data: Uint8Array) => {
         try {
-          controller.enqueue(encoder.encode(data));
+          controller.enqueue(data);
         } catch (error) {
           console.error('[SESSION_EVENTS] Failed to enqueue data:', error);
         }
@@ -34,13 +33,12 @@ export async function GET(request: NextRequest) {
           data: { session_id: sessionId }
         };
 
-        const sseData = `data: ${JSON.stringify(event)}\n\n`;
-        safeEnqueue(sseData);
+        safeEnqueue(encodeSseEvent(event));
       });
 
       // Send keepalive comments every 30 seconds to prevent connection timeout
       keepAliveInterval = setInterval(() => {
-        safeEnqueue(': keepalive\n\n');
+        safeEnqueue(SSE_KEEPALIVE);
       }, 30000);
 
       // Handle client disconnect
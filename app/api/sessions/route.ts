@@ -23,10 +23,9 @@ export async function GET() {
 
       // Get total tokens from last token_usage event
       let totalTokens = 0;
-      const tokenEvents = data.events?.filter((e: any) => e.event_type === 'token_usage') || [];
+      const lastEvent = data.events?.findLast((e: any) => e.event_type === 'token_usage');
 
-      if (tokenEvents.length > 0) {
-        const lastEvent = tokenEvents[tokenEvents.length - 1];
+      if (lastEvent) {
         const cumulative = lastEvent.cumulative || {};
         totalTokens = (cumulative.total_input_tokens || 0) + (cumulative.total_output_tokens || 0);
       }
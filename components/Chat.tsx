@@ -2,7 +2,7 @@
 
 import { useState, useRef, useEffect, useCallback } from 'react';
 import { api } from '@/lib/api';
-import { TokenUsage, StreamEvent, ToolCallEvent } from '@/types';
+import { TokenUsage, StreamEvent, ToolCallEvent, MemoryOperationEvent } from '@/types';
 import { useMemoryContext } from '@/lib/contexts/MemoryContext';
 import { useToolCallContext } from '@/lib/contexts/ToolCallContext';
 
@@ -18,6 +18,29 @@ interface Message {
   toolUses?: string[];
 }
 
+// Memory tool command -> UI memory operation (built once, not per tool call)
+const COMMAND_TO_OPERATION: Record<string, MemoryOperationEvent['operation']> = {
+  'view': 'read',
+  'create': 'create',
+  'str_replace': 'update',
+  'insert': 'update',
+  'delete': 'delete',
+  'rename': 'rename'
+};
+
+const MEMORY_ROOT = '/memories';
+const MEMORY_PREFIX = `${MEMORY_ROOT}/`;
+
+// Normalize path by removing /memories prefix to match file list format
+function normalizeMemoryPath(path: string): string {
+  if (!path) return '';
+  return path.startsWith(MEMORY_PREFIX)
+    ? path.substring(MEMORY_PREFIX.length)
+    : path.startsWith(MEMORY_ROOT)
+    ? path.substring(MEMORY_ROOT.length).replace(/^\//, '')
+    : path;
+}
+
 export default function Chat({ sessionActive, modelName, sessionKey }: ChatProps) {
   const { triggerMemoryOperation } = useMemoryContext();
   const { triggerToolCall } = useToolCallContext();
@@ -54,35 +77,16 @@ export default function Chat({ sessionActive, modelName, sessionKey }: ChatProps
   const deriveMemoryOperation = useCallback((toolCall: ToolCallEvent) => {
     if (toolCall.tool_name !== 'memory') return null;
 
-    const opMap: Record<string, string> = {
-      'view': 'read',
-      'create': 'create',
-      'str_replace': 'update',
-      'insert': 'update',
-      'delete': 'delete',
-      'rename': 'rename'
-    };
-
-    const operation = opMap[toolCall.command];
+    const operation = COMMAND_TO_OPERATION[toolCall.command];
     if (!operation) return null;
 
-    // Normalize path by removing /memories prefix to match file list format
-    const normalizePath = (path: string) => {
-      if (!path) return '';
-      return path.startsWith('/memories/')
-        ? path.substring('/memories/'.length)
-        : path.startsWith('/memories')
-        ? path.substring('/memories'.length).replace(/^\//, '')
-        : path;
-    };
-
     const rawPath = toolCall.parameters.path || toolCall.parameters.old_path || '';
     const rawNewPath = toolCall.parameters.new_path;
 
     return {
-      operation: operation as 'create' | 'read' | 'update' | 'delete' | 'rename',
-      path: normalizePath(rawPath),
-      new_path: rawNewPath ? normalizePath(rawNewPath) : undefined,
+      operation,
+      path: normalizeMemoryPath(rawPath),
+      new_path: rawNewPath ? normalizeMemoryPath(rawNewPath) : undefined,
       timestamp: toolCall.timestamp
     };
   }, []);
@@ -112,7 +116,9 @@ export default function Chat({ sessionActive, modelName, sessionKey }: ChatProps
         break;
 
       case 'tool_use_start':
-        setCurrentToolUses((prev) => [...prev, event.data.tool]);
+        setCurrentToolUses((prev) =>
+          prev.includes(event.data.tool) ? prev : [...prev, event.data.tool]
+        );
         break;
 
       case 'done':
@@ -179,8 +185,11 @@ export default function Chat({ sessionActive, modelName, sessionKey }: ChatProps
                   accumulatedText = event.data;
                   setCurrentAssistantMessage(accumulatedText);
                 } else if (event.type === 'tool_use_start') {
-                  accumulatedTools.push(event.data.tool);
-                  setCurrentToolUses(accumulatedTools);
+                  // One chip per distinct tool; pass a fresh array so React re-renders
+                  if (!accumulatedTools.includes(event.data.tool)) {
+                    accumulatedTools = [...accumulatedTools, event.data.tool];
+                    setCurrentToolUses(accumulatedTools);
+                  }
                 } else if (event.type === 'done') {
                   // Use locally accumulated text for final message
                   setIsTyping(false);
@@ -0,0 +1,28 @@
+/**
+ * Shared Anthropic client instances
+ * Holds at most two clients: one for the server's env key (used by /api/models)
+ * and one for the most recent session key. Older session keys are released
+ * rather than kept alive for the life of the process.
+ */
+
+import Anthropic from '@anthropic-ai/sdk';
+
+let envClient: Anthropic | null = null;
+let sessionClient: { apiKey: string; client: Anthropic } | null = null;
+
+/**
+ * Get the shared client for an API key, creating it on first use
+ */
+export function getAnthropicClient(apiKey?: string): Anthropic {
+  if (apiKey === undefined || apiKey === process.env.ANTHROPIC_API_KEY) {
+    envClient ??= new Anthropic({ apiKey });
+    return envClient;
+  }
+
+  // A new session key replaces the previous one
+  if (sessionClient?.apiKey !== apiKey) {
+    sessionClient = { apiKey, client: new Anthropic({ apiKey }) };
+  }
+
+  return sessionClient.client;
+}
@@ -8,6 +8,7 @@
 
 export class AsyncEventQueue<T> {
   private queue: T[] = [];
+  private head = 0; // Index of the next item to drain
   private closed = false;
 
   /**
@@ -27,16 +28,21 @@ export class AsyncEventQueue<T> {
    * Returns a generator that yields all current items in FIFO order.
    */
   *drain(): Generator<T, void, undefined> {
-    while (this.queue.length > 0) {
-      yield this.queue.shift()!;
+    // Advance a read index instead of shift(), which re-indexes the array on every call
+    while (this.head < this.queue.length) {
+      const item = this.queue[this.head];
+      this.head++;
+      yield item;
     }
+    this.queue = [];
+    this.head = 0;
   }
 
   /**
    * Check if the queue has any pending events
    */
   hasEvents(): boolean {
-    return this.queue.length > 0;
+    return this.head < this.queue.length;
   }
 
   /**
@@ -45,6 +51,7 @@ export class AsyncEventQueue<T> {
    */
   clear(): void {
     this.queue = [];
+    this.head = 0;
   }
 
   /**
@@ -59,7 +66,7 @@ export class AsyncEventQueue<T> {
    * Get the current queue size
    */
   size(): number {
-    return this.queue.length;
+    return this.queue.length - this.head;
   }
 
   /**
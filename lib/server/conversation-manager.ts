@@ -4,12 +4,14 @@
  */
 
 import Anthropic from '@anthropic-ai/sdk';
+import { getAnthropicClient } from './anthropic-client';
 import { LocalFilesystemMemoryTool } from './memory-tool';
-import { SessionTrace } from './session-trace';
+import { SessionTrace, TokenCounts } from './session-trace';
 import { AsyncEventQueue } from './async-event-queue';
+import { triggerSessionChange } from './global-state';
 
 export interface StreamEvent {
-  type: 'thinking' | 'tool_call' | 'text' | 'text_delta' | 'done' | 'error';
+  type: 'thinking' | 'tool_call' | 'tool_use_start' | 'text' | 'text_delta' | 'done' | 'error';
   data: any;
 }
 
@@ -20,6 +22,15 @@ export interface TokenStats {
   total_cache_write: number;
 }
 
+const TOKEN_KEYS: readonly (keyof TokenCounts)[] = ['input', 'output', 'cache_read', 'cache_write'];
+
+// Token summary sent with the done event (matches the client's TokenUsage fields)
+type TokenSummary = Record<`last_${keyof TokenCounts}` | `total_${keyof TokenCounts}`, number>;
+
+function emptyTokenCounts(): TokenCounts {
+  return { input: 0, output: 0, cache_read: 0, cache_write: 0 };
+}
+
 interface Message {
   role: 'user' | 'assistant';
   content: string | any[];
@@ -29,36 +40,48 @@ export class ConversationManager {
   private client: Anthropic;
   private model: string;
   private systemPrompt: string;
+  private systemPromptBlocks: Anthropic.Beta.BetaTextBlockParam[];
   private memoryTool: LocalFilesystemMemoryTool;
   private messages: Message[] = [];
   private trace: SessionTrace;
   private eventQueue: AsyncEventQueue<{ type: string; data: any }>;
 
   // Token tracking
-  private totalInputTokens = 0;
-  private totalOutputTokens = 0;
-  private totalCacheReadTokens = 0;
-  private totalCacheWriteTokens = 0;
+  private totals: TokenCounts = emptyTokenCounts();
 
   constructor(apiKey: string, model: string, systemPrompt: string) {
-    this.client = new Anthropic({ apiKey });
+    this.client = getAnthropicClient(apiKey);
     this.model = model;
     this.systemPrompt = systemPrompt;
     this.memoryTool = new LocalFilesystemMemoryTool();
 
+    // Send the system prompt as a structured block with a cache breakpoint.
+    // The cached prefix covers tools + system, which are identical on every turn.
+    this.systemPromptBlocks = [
+      { type: 'text', text: systemPrompt, cache_control: { type: 'ephemeral' } }
+    ];
+
     // Initialize event queue for real-time streaming
     this.eventQueue = new AsyncEventQueue();
 
     // Initialize session trace with callback to capture events
-    this.trace = new SessionTrace(
+    this.trace = this.createTrace();
+
+    console.log(`[ConversationManager] Initialized with model: ${model}`);
+  }
+
+  /**
+   * Start a session trace that feeds the event queue and connect it to the memory tool
+   */
+  private createTrace(): SessionTrace {
+    const trace = new SessionTrace(
       './sessions',
-      model,
-      systemPrompt,
+      this.model,
+      this.systemPrompt,
       (event) => this.eventQueue.enqueue(event)
     );
-    this.memoryTool.setTrace(this.trace);
-
-    console.log(`[ConversationManager] Initialized with model: ${model}`);
+    this.memoryTool.setTrace(trace);
+    return trace;
   }
 
   /**
@@ -73,6 +96,26 @@ export class ConversationManager {
     }
   }
 
+  /**
+   * Build the request messages with a rolling cache breakpoint on the latest message.
+   * Stored history stays plain, so the breakpoint moves forward each turn and the
+   * previously sent prefix is served from the prompt cache.
+   */
+  private buildRequestMessages(): Message[] {
+    const requestMessages = this.messages.slice();
+    const lastIndex = requestMessages.length - 1;
+    const last = requestMessages[lastIndex];
+
+    if (last && typeof last.content === 'string') {
+      requestMessages[lastIndex] = {
+        role: last.role,
+        content: [{ type: 'text', text: last.content, cache_control: { type: 'ephemeral' } }]
+      };
+    }
+
+    return requestMessages;
+  }
+
   async *sendMessageStreaming(userMessage: string): AsyncGenerator<StreamEvent> {
     // Add user message
     this.messages.push({ role: 'user', content: userMessage });
@@ -96,8 +139,8 @@ export class ConversationManager {
       const runner = this.client.beta.messages.toolRunner({
         model: this.model,
         max_tokens: 2048,
-        system: this.systemPrompt,
-        messages: this.messages as any,
+        system: this.systemPromptBlocks,
+        messages: this.buildRequestMessages() as any,
         tools: [this.memoryTool.toRunnableTool()],
         stream: true, // Enable streaming
       });
@@ -105,33 +148,52 @@ export class ConversationManager {
       // Track accumulated response text across all messages
       let responseText = '';
 
+      // Track token usage across every API call in the tool loop
+      // (the runner's final message only reports the last call)
+      const last = emptyTokenCounts();
+
       // Process nested streams for real-time text
       for await (const messageStream of runner) {
         // Process each streaming event within this message
         for await (const event of messageStream) {
-          // Emit text deltas as they arrive
-          if (event.type === 'content_block_delta') {
-            const delta = event.delta as any;
-            if (delta?.type === 'text_delta' && delta?.text) {
-              responseText += delta.text;
-              yield {
-                type: 'text_delta',
-                data: delta.text
-              };
+          // Dispatch on the event type once per SDK event
+          switch (event.type) {
+            case 'content_block_delta': {
+              // Emit text deltas as they arrive
+              const delta = event.delta as any;
+              const text = delta?.type === 'text_delta' ? delta.text : undefined;
+              if (text) {
+                responseText += text;
+                yield {
+                  type: 'text_delta',
+                  data: text
+                };
+              }
+              break;
             }
-          }
 
-          // Log tool use events
-          if (event.type === 'content_block_start') {
-            const contentBlock = event.content_block as any;
-            if (contentBlock?.type === 'tool_use') {
-              console.log(`[ConversationManager] Tool use started: ${contentBlock.name}`);
+            case 'content_block_start': {
+              // Announce tool use as soon as the model starts the block,
+              // before its input streams in and the tool executes
+              const contentBlock = event.content_block as any;
+              if (contentBlock?.type === 'tool_use') {
+                const toolName = contentBlock.name;
+                console.log(`[ConversationManager] Tool use started: ${toolName}`);
+                yield {
+                  type: 'tool_use_start',
+                  data: { tool: toolName }
+                };
+              }
+              break;
             }
           }
 
           // Drain tool call events after every SDK event (real-time streaming)
-          // This ensures tool calls are emitted immediately, even before text generation
-          yield* this.drainEventQueue();
+          // This ensures tool calls are emitted immediately, even before text generation.
+          // Most events (text deltas) have nothing queued, so skip the drain entirely then.
+          if (this.eventQueue.hasEvents()) {
+            yield* this.drainEventQueue();
+          }
         }
 
         // Get the final message from this stream for tool logging
@@ -143,47 +205,39 @@ export class ConversationManager {
         // reference that the SDK uses internally, mutating it here cleans it before the
         // SDK pushes it to params.messages. This avoids using setMessagesParams() which
         // would set _mutated=true and break the loop's exit condition.
-        for (let i = 0; i < message.content.length; i++) {
-          const block = message.content[i] as any;
+        for (const block of message.content as any[]) {
           if (block.type === 'text' && 'parsed' in block) {
             delete block.parsed;
           }
         }
 
+        // Accumulate usage reported by this message's terminal message_delta
+        const usage = message.usage as any;
+        last.input += usage?.input_tokens || 0;
+        last.output += usage?.output_tokens || 0;
+        last.cache_read += usage?.cache_read_input_tokens || 0;
+        last.cache_write += usage?.cache_creation_input_tokens || 0;
+
         // Drain any remaining tool call events after this message completes
         yield* this.drainEventQueue();
       }
 
-      // Get final result from runner
-      const finalMessage = await runner;
-
       // Update messages with final response
       this.messages.push({ role: 'assistant', content: responseText });
       this.trace.logLlmResponse(responseText);
 
-      // Track token usage from final message
-      const usage = finalMessage.usage;
-      const lastInput = usage?.input_tokens || 0;
-      const lastOutput = usage?.output_tokens || 0;
-      const lastCacheRead = (usage as any)?.cache_read_input_tokens || 0;
-      const lastCacheWrite = (usage as any)?.cache_creation_input_tokens || 0;
+      // Update cumulative token usage and build the per-turn summary in one pass
+      const tokens = {} as TokenSummary;
+      for (const key of TOKEN_KEYS) {
+        this.totals[key] += last[key];
+        tokens[`last_${key}`] = last[key];
+        tokens[`total_${key}`] = this.totals[key];
+      }
 
-      this.totalInputTokens += lastInput;
-      this.totalOutputTokens += lastOutput;
-      this.totalCacheReadTokens += lastCacheRead;
-      this.totalCacheWriteTokens += lastCacheWrite;
+      console.log(`[ConversationManager] Prompt cache: read=${last.cache_read}, write=${last.cache_write}, uncached=${last.input}`);
 
       // Log token usage
-      this.trace.logTokenUsage(
-        lastInput,
-        lastOutput,
-        lastCacheRead,
-        lastCacheWrite,
-        this.totalInputTokens,
-        this.totalOutputTokens,
-        this.totalCacheReadTokens,
-        this.totalCacheWriteTokens
-      );
+      this.trace.logTokenUsage(last, this.totals);
 
       // Final drain to ensure all events are sent before completion
       yield* this.drainEventQueue();
@@ -191,18 +245,7 @@ export class ConversationManager {
       // Send final done event with token info
       yield {
         type: 'done',
-        data: {
-          tokens: {
-            last_input: lastInput,
-            last_output: lastOutput,
-            last_cache_read: lastCacheRead,
-            last_cache_write: lastCacheWrite,
-            total_input: this.totalInputTokens,
-            total_output: this.totalOutputTokens,
-            total_cache_read: this.totalCacheReadTokens,
-            total_cache_write: this.totalCacheWriteTokens
-          }
-        }
+        data: { tokens }
       };
     } catch (error: any) {
       console.error(`[ConversationManager] Error in conversation:`, error);
@@ -218,32 +261,30 @@ export class ConversationManager {
     }
   }
 
-  getMemoryContents(): string {
-    return this.memoryTool.view({ path: '/memories' });
+  /**
+   * Stream the contents of every memory file, one file at a time
+   */
+  iterMemoryContents(): AsyncGenerator<{ path: string; content: string }> {
+    return this.memoryTool.iterMemoryFiles();
   }
 
-  clearMemories(): string {
-    const result = this.memoryTool.clearAllMemory();
+  async getMemoryContents(): Promise<string> {
+    return this.memoryTool.execute({ command: 'view', path: '/memories' });
+  }
+
+  async clearMemories(): Promise<string> {
+    const result = await this.memoryTool.clearAllMemory();
     this.messages = [];
 
     // Reset token counters
-    this.totalInputTokens = 0;
-    this.totalOutputTokens = 0;
-    this.totalCacheReadTokens = 0;
-    this.totalCacheWriteTokens = 0;
+    this.totals = emptyTokenCounts();
 
     // Reset event queue
     this.eventQueue = new AsyncEventQueue();
 
     // Start new trace with callback
     this.trace.finalize();
-    this.trace = new SessionTrace(
-      './sessions',
-      this.model,
-      this.systemPrompt,
-      (event) => this.eventQueue.enqueue(event)
-    );
-    this.memoryTool.setTrace(this.trace);
+    this.trace = this.createTrace();
 
     // Notify listeners that session has changed
     this.notifySessionChange();
@@ -256,8 +297,6 @@ export class ConversationManager {
    * This is called when a new session is created (e.g., during memory clear)
    */
   private notifySessionChange(): void {
-    // Import here to avoid circular dependency issues
-    const { triggerSessionChange } = require('./global-state');
     // Trigger notification with the new session ID
     triggerSessionChange(this.getSessionId());
   }
@@ -268,10 +307,10 @@ export class ConversationManager {
 
   getTokenStats(): TokenStats {
     return {
-      total_input: this.totalInputTokens,
-      total_output: this.totalOutputTokens,
-      total_cache_read: this.totalCacheReadTokens,
-      total_cache_write: this.totalCacheWriteTokens
+      total_input: this.totals.input,
+      total_output: this.totals.output,
+      total_cache_read: this.totals.cache_read,
+      total_cache_write: this.totals.cache_write
     };
   }
 
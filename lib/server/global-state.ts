@@ -3,7 +3,7 @@
  * Stores the active conversation manager instance and notifies listeners of session changes
  */
 
-import { ConversationManager } from './conversation-manager';
+import type { ConversationManager } from './conversation-manager';
 
 // Global conversation manager (single-user POC)
 let conversationManager: ConversationManager | null = null;
@@ -20,6 +20,11 @@ export class LocalFilesystemMemoryTool {
   private trace: SessionTrace | null = null;
   private logger: MemoryOperationLogger;
 
+  // Tail of the pending operation chain. The tool runner may execute several
+  // tool_use blocks concurrently, and str_replace/insert are read-modify-write,
+  // so operations run one at a time to avoid lost updates.
+  private operationChain: Promise<unknown> = Promise.resolve();
+
   constructor(basePath: string = './memories', logDir: string = './logs') {
     this.basePath = basePath;
     this.memoryRoot = basePath;  // Use the base path directly as the memory root
@@ -82,7 +87,21 @@ export class LocalFilesystemMemoryTool {
     return fullPath;
   }
 
-  view(command: { path: string; view_range?: [number, number] }): string {
+  /**
+   * Stat a path, returning null if it does not exist
+   */
+  private async _stat(fullPath: string): Promise<fs.Stats | null> {
+    try {
+      return await fs.promises.stat(fullPath);
+    } catch (error: any) {
+      if (error.code === 'ENOENT' || error.code === 'ENOTDIR') {
+        return null;
+      }
+      throw error;
+    }
+  }
+
+  async view(command: { path: string; view_range?: [number, number] }): Promise<string> {
     console.log(`[MEMORY] view() called: path=${command.path}, view_range=${command.view_range}`);
 
     // Log tool call to trace
@@ -95,18 +114,22 @@ export class LocalFilesystemMemoryTool {
 
     try {
       const fullPath = this._validatePath(command.path);
+      const stat = await this._stat(fullPath);
 
       // Check if it's a directory
-      if (fs.existsSync(fullPath) && fs.statSync(fullPath).isDirectory()) {
+      if (stat?.isDirectory()) {
         const items: string[] = [];
-        const entries = fs.readdirSync(fullPath);
+        const entries = await fs.promises.readdir(fullPath, { withFileTypes: true });
+        entries.sort((a, b) => (a.name < b.name ? -1 : a.name > b.name ? 1 : 0));
 
-        for (const entry of entries.sort()) {
-          if (entry.startsWith('.')) continue;
+        for (const entry of entries) {
+          if (entry.name.startsWith('.')) continue;
 
-          const entryPath = path.join(fullPath, entry);
-          const isDir = fs.statSync(entryPath).isDirectory();
-          items.push(isDir ? `${entry}/` : entry);
+          // Entry types come with the listing; only symlinks need a stat to resolve
+          const isDir = entry.isSymbolicLink()
+            ? (await this._stat(path.join(fullPath, entry.name)))?.isDirectory() ?? false
+            : entry.isDirectory();
+          items.push(isDir ? `${entry.name}/` : entry.name);
         }
 
         const result = `Directory: ${command.path}\n${items.map(item => `- ${item}`).join('\n')}`;
@@ -115,11 +138,11 @@ export class LocalFilesystemMemoryTool {
       }
 
       // File reading
-      if (!fs.existsSync(fullPath)) {
+      if (!stat) {
         throw new Error(`Path ${command.path} does not exist`);
       }
 
-      let content = fs.readFileSync(fullPath, 'utf-8');
+      let content = await fs.promises.readFile(fullPath, 'utf-8');
       let lines = content.split('\n');
 
       // Apply line range if specified
@@ -160,7 +183,7 @@ export class LocalFilesystemMemoryTool {
     }
   }
 
-  create(command: { path: string; file_text: string }): string {
+  async create(command: { path: string; file_text: string }): Promise<string> {
     console.log(`[MEMORY] create() called: path=${command.path}`);
 
     // Log tool call to trace
@@ -174,19 +197,16 @@ export class LocalFilesystemMemoryTool {
     try {
       const fullPath = this._validatePath(command.path);
 
-      if (fs.existsSync(fullPath)) {
+      if (await this._stat(fullPath)) {
         throw new Error(
           `File already exists: ${command.path}. Use str_replace or insert to modify.`
         );
       }
 
       // Create parent directories if needed
-      const dirPath = path.dirname(fullPath);
-      if (!fs.existsSync(dirPath)) {
-        fs.mkdirSync(dirPath, { recursive: true });
-      }
+      await fs.promises.mkdir(path.dirname(fullPath), { recursive: true });
 
-      fs.writeFileSync(fullPath, command.file_text, 'utf-8');
+      await fs.promises.writeFile(fullPath, command.file_text, 'utf-8');
 
       const normalizedPath = this._normalizePath(command.path);
       const lines = command.file_text.split('\n');
@@ -219,7 +239,7 @@ export class LocalFilesystemMemoryTool {
     }
   }
 
-  str_replace(command: { path: string; old_str: string; new_str: string }): string {
+  async str_replace(command: { path: string; old_str: string; new_str: string }): Promise<string> {
     console.log(`[MEMORY] str_replace() called: path=${command.path}`);
 
     // Log tool call to trace
@@ -234,11 +254,12 @@ export class LocalFilesystemMemoryTool {
     try {
       const fullPath = this._validatePath(command.path);
 
-      if (!fs.existsSync(fullPath) || !fs.statSync(fullPath).isFile()) {
+      const stat = await this._stat(fullPath);
+      if (!stat?.isFile()) {
         throw new Error(`File not found: ${command.path}`);
       }
 
-      const content = fs.readFileSync(fullPath, 'utf-8');
+      const content = await fs.promises.readFile(fullPath, 'utf-8');
 
       // Verify old_str appears exactly once
       const count = (content.match(new RegExp(command.old_str.replace(/[.*+?^${}()|[\]\\]/g, '\\$&'), 'g')) || []).length;
@@ -249,7 +270,7 @@ export class LocalFilesystemMemoryTool {
       }
 
       const newContent = content.replace(command.old_str, command.new_str);
-      fs.writeFileSync(fullPath, newContent, 'utf-8');
+      await fs.promises.writeFile(fullPath, newContent, 'utf-8');
 
       const normalizedPath = this._normalizePath(command.path);
 
@@ -281,7 +302,7 @@ export class LocalFilesystemMemoryTool {
     }
   }
 
-  insert(command: { path: string; line: number; insert_line: string }): string {
+  async insert(command: { path: string; line: number; insert_line: string }): Promise<string> {
     console.log(`[MEMORY] insert() called: path=${command.path}, line=${command.line}`);
 
     // Log tool call to trace
@@ -296,11 +317,12 @@ export class LocalFilesystemMemoryTool {
     try {
       const fullPath = this._validatePath(command.path);
 
-      if (!fs.existsSync(fullPath) || !fs.statSync(fullPath).isFile()) {
+      const stat = await this._stat(fullPath);
+      if (!stat?.isFile()) {
         throw new Error(`File not found: ${command.path}`);
       }
 
-      const content = fs.readFileSync(fullPath, 'utf-8');
+      const content = await fs.promises.readFile(fullPath, 'utf-8');
       const lines = content.split('\n');
 
       // Convert 1-indexed to 0-indexed
@@ -317,7 +339,7 @@ export class LocalFilesystemMemoryTool {
       }
 
       lines.splice(insertIdx, 0, insertText);
-      fs.writeFileSync(fullPath, lines.join('\n'), 'utf-8');
+      await fs.promises.writeFile(fullPath, lines.join('\n'), 'utf-8');
 
       const normalizedPath = this._normalizePath(command.path);
 
@@ -349,7 +371,7 @@ export class LocalFilesystemMemoryTool {
     }
   }
 
-  delete(command: { path: string }): string {
+  async delete(command: { path: string }): Promise<string> {
     console.log(`[MEMORY] delete() called: path=${command.path}`);
 
     // Log tool call to trace
@@ -360,19 +382,20 @@ export class LocalFilesystemMemoryTool {
     try {
       const fullPath = this._validatePath(command.path);
 
-      if (!fs.existsSync(fullPath)) {
+      const stat = await this._stat(fullPath);
+      if (!stat) {
         throw new Error(`Path not found: ${command.path}`);
       }
 
       const normalizedPath = this._normalizePath(command.path);
-      const isDirectory = fs.statSync(fullPath).isDirectory();
+      const isDirectory = stat.isDirectory();
 
       let resultMsg: string;
       if (isDirectory) {
-        fs.rmSync(fullPath, { recursive: true, force: true });
+        await fs.promises.rm(fullPath, { recursive: true, force: true });
         resultMsg = `Successfully deleted directory ${command.path}`;
       } else {
-        fs.unlinkSync(fullPath);
+        await fs.promises.unlink(fullPath);
         resultMsg = `Successfully deleted ${command.path}`;
       }
 
@@ -402,7 +425,7 @@ export class LocalFilesystemMemoryTool {
     }
   }
 
-  rename(command: { old_path: string; new_path: string }): string {
+  async rename(command: { old_path: string; new_path: string }): Promise<string> {
     console.log(`[MEMORY] rename() called: old_path=${command.old_path}, new_path=${command.new_path}`);
 
     // Log tool call to trace
@@ -417,21 +440,18 @@ export class LocalFilesystemMemoryTool {
       const fullOldPath = this._validatePath(command.old_path);
       const fullNewPath = this._validatePath(command.new_path);
 
-      if (!fs.existsSync(fullOldPath)) {
+      if (!(await this._stat(fullOldPath))) {
         throw new Error(`File not found: ${command.old_path}`);
       }
 
-      if (fs.existsSync(fullNewPath)) {
+      if (await this._stat(fullNewPath)) {
         throw new Error(`Destination already exists: ${command.new_path}`);
       }
 
       // Create parent directories if needed
-      const newDir = path.dirname(fullNewPath);
-      if (!fs.existsSync(newDir)) {
-        fs.mkdirSync(newDir, { recursive: true });
-      }
+      await fs.promises.mkdir(path.dirname(fullNewPath), { recursive: true });
 
-      fs.renameSync(fullOldPath, fullNewPath);
+      await fs.promises.rename(fullOldPath, fullNewPath);
 
       const normalizedOldPath = this._normalizePath(command.old_path);
       const normalizedNewPath = this._normalizePath(command.new_path);
@@ -464,14 +484,63 @@ export class LocalFilesystemMemoryTool {
     }
   }
 
-  clearAllMemory(): string {
-    console.warn('[MEMORY] clearAllMemory() called - deleting all memories');
+  /**
+   * Walk the memory directory and yield each file's contents, one file at a time.
+   * This reads storage directly for the UI, so it is not traced as a tool call.
+   */
+  iterMemoryFiles(): AsyncGenerator<{ path: string; content: string }> {
+    return this._walkMemoryFiles(this.memoryRoot);
+  }
+
+  private async *_walkMemoryFiles(dir: string): AsyncGenerator<{ path: string; content: string }> {
+    // The walk itself is not one chained operation (that would block tool calls for the
+    // whole stream), so a concurrent delete/rename can remove entries mid-walk. Those are
+    // skipped instead of failing the whole listing. Each file read is queued on the
+    // operation chain, so a file is never streamed half-written by an in-flight tool call.
+    const isGone = (error: any) => error.code === 'ENOENT' || error.code === 'ENOTDIR';
 
+    let entries: fs.Dirent[];
     try {
-      if (fs.existsSync(this.memoryRoot)) {
-        fs.rmSync(this.memoryRoot, { recursive: true, force: true });
-        fs.mkdirSync(this.memoryRoot, { recursive: true });
+      entries = await fs.promises.readdir(dir, { withFileTypes: true });
+    } catch (error: any) {
+      if (isGone(error)) return;
+      throw error;
+    }
+    entries.sort((a, b) => (a.name < b.name ? -1 : a.name > b.name ? 1 : 0));
+
+    for (const entry of entries) {
+      if (entry.name.startsWith('.')) continue;
+
+      const fullPath = path.join(dir, entry.name);
+      if (entry.isDirectory()) {
+        yield* this._walkMemoryFiles(fullPath);
+      } else if (entry.isFile()) {
+        let content: string;
+        try {
+          content = await this._enqueue(() => fs.promises.readFile(fullPath, 'utf-8'));
+        } catch (error: any) {
+          if (isGone(error)) continue;
+          throw error;
+        }
+
+        const relativePath = path.relative(this.memoryRoot, fullPath).split(path.sep).join('/');
+        yield { path: `/memories/${relativePath}`, content };
       }
+    }
+  }
+
+  // Clear all memories, queued behind any tool operations still in flight so a
+  // half-finished create/str_replace/rename cannot recreate files after the clear
+  clearAllMemory(): Promise<string> {
+    return this._enqueue(() => this._clearAllMemory());
+  }
+
+  private async _clearAllMemory(): Promise<string> {
+    console.warn('[MEMORY] clearAllMemory() called - deleting all memories');
+
+    try {
+      await fs.promises.rm(this.memoryRoot, { recursive: true, force: true });
+      await fs.promises.mkdir(this.memoryRoot, { recursive: true });
 
       console.log('[MEMORY] ✓ All memories cleared');
       return 'All memories have been cleared';
@@ -550,8 +619,20 @@ export class LocalFilesystemMemoryTool {
     });
   }
 
-  // Execute a tool call
-  execute(input: any): string {
+  // Run an operation after every operation already queued has settled
+  private _enqueue<T>(operation: () => Promise<T>): Promise<T> {
+    const result = this.operationChain.then(operation);
+    // Keep the chain going even when this operation fails
+    this.operationChain = result.catch(() => undefined);
+    return result;
+  }
+
+  // Execute a tool call, serialized behind any operations still in flight
+  execute(input: any): Promise<string> {
+    return this._enqueue(() => this._dispatch(input));
+  }
+
+  private async _dispatch(input: any): Promise<string> {
     const command = input.command;
 
     switch (command) {
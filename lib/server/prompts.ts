@@ -6,24 +6,48 @@
 import * as fs from 'fs';
 import * as path from 'path';
 
+// Parsed prompt bodies keyed by file path, invalidated when mtime or size changes
+const MAX_CACHED_PROMPTS = 16;
+const promptBodyCache = new Map<string, { mtimeMs: number; size: number; body: string }>();
+
+function parsePromptBody(content: string): string {
+  /**
+   * Strip comment lines and trailing whitespace from raw prompt file content.
+   */
+  return content
+    .replace(/^[^\S\n]*#[^\n]*(?:\n|$)/gm, '')
+    .replace(/[^\S\n]+$/gm, '')
+    .trim();
+}
+
+function loadPromptBody(promptFile: string): string {
+  /**
+   * Load the parsed prompt body, re-reading the file only when it has changed.
+   */
+  const stat = fs.statSync(promptFile);
+  const cached = promptBodyCache.get(promptFile);
+  if (cached && cached.mtimeMs === stat.mtimeMs && cached.size === stat.size) {
+    return cached.body;
+  }
+
+  const body = parsePromptBody(fs.readFileSync(promptFile, 'utf-8'));
+
+  promptBodyCache.delete(promptFile);
+  promptBodyCache.set(promptFile, { mtimeMs: stat.mtimeMs, size: stat.size, body });
+  if (promptBodyCache.size > MAX_CACHED_PROMPTS) {
+    // Evict the oldest entry (Map preserves insertion order)
+    promptBodyCache.delete(promptBodyCache.keys().next().value!);
+  }
+
+  return body;
+}
+
 export function loadSystemPrompt(promptFile: string): string {
   /**
    * Load system prompt from file, stripping comment lines and appending current date.
    */
   try {
-    const content = fs.readFileSync(promptFile, 'utf-8');
-    const lines: string[] = [];
-
-    for (const line of content.split('\n')) {
-      const stripped = line.trim();
-      if (stripped && !stripped.startsWith('#')) {
-        lines.push(line.trimEnd());
-      } else if (!stripped) {
-        lines.push('');
-      }
-    }
-
-    let prompt = lines.join('\n').trim();
+    let prompt = loadPromptBody(promptFile);
 
     // Append current date/time
     const currentDate = new Date().toISOString().replace('T', ' ').substring(0, 19);
@@ -46,19 +70,26 @@ export function getAvailablePrompts(promptsDir: string = 'prompts'): PromptInfo[
   /**
    * Get list of available system prompts.
    */
-  if (!fs.existsSync(promptsDir)) {
-    return [];
+  let entries: fs.Dirent[];
+  try {
+    // Single directory read; file types come with the entries, no per-file stat
+    entries = fs.readdirSync(promptsDir, { withFileTypes: true });
+  } catch (error: any) {
+    if (error.code === 'ENOENT') {
+      return [];
+    }
+    throw error;
   }
 
-  const files = fs.readdirSync(promptsDir);
-  const promptFiles = files
-    .filter(f => f.endsWith('.txt'))
-    .sort()
-    .map(f => ({
-      name: path.basename(f, '.txt'),
-      path: path.join(promptsDir, f),
-      filename: f
-    }));
+  const filenames = entries
+    // Symlinks are kept: Dirent.isFile() is false for them, but loadSystemPrompt follows links
+    .filter(entry => (entry.isFile() || entry.isSymbolicLink()) && entry.name.endsWith('.txt'))
+    .map(entry => entry.name)
+    .sort();
 
-  return promptFiles;
+  return filenames.map(filename => ({
+    name: filename.slice(0, -'.txt'.length),
+    path: path.join(promptsDir, filename),
+    filename
+  }));
 }
@@ -5,20 +5,7 @@
  * showing the interaction flow between User, Host App, LLM, and Memory System.
  */
 
-interface TraceEvent {
-  timestamp: string;
-  event_type: string;
-  [key: string]: any;
-}
-
-interface TraceData {
-  session_id: string;
-  start_time: string;
-  end_time?: string;
-  model: string;
-  system_prompt: string;
-  events: TraceEvent[];
-}
+import type { TraceData } from './session-trace';
 
 function escapeText(text: string, maxLength: number = 50): string {
   /**
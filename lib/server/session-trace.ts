@@ -9,6 +9,9 @@
  * - Token usage statistics
  *
  * Each session is stored in a separate timestamped JSON file in the sessions/ directory.
+ * The file stays open for the life of the session and each event is written in place
+ * ahead of the closing brackets, so the file is valid JSON after every event without
+ * rewriting the whole trace.
  */
 
 import * as fs from 'fs';
@@ -17,13 +20,13 @@ import { randomBytes } from 'crypto';
 
 type TraceEventCallback = (event: { type: string; data: any }) => void;
 
-interface TraceEvent {
+export interface TraceEvent {
   timestamp: string;
   event_type: string;
   [key: string]: any;
 }
 
-interface TraceData {
+export interface TraceData {
   session_id: string;
   start_time: string;
   end_time?: string;
@@ -32,13 +35,29 @@ interface TraceData {
   events: TraceEvent[];
 }
 
+export interface TokenCounts {
+  input: number;
+  output: number;
+  cache_read: number;
+  cache_write: number;
+}
+
 export class SessionTrace {
   private basePath: string;
   private sessionId: string;
-  private trace: TraceData;
+  private trace: Omit<TraceData, 'events'>;
   private traceFile: string;
   private eventCallback?: TraceEventCallback;
 
+  // Header fields followed by an opening events array
+  private header: string;
+  private headerWritten = false;
+
+  // Open trace file descriptor and byte offset where the next event is written
+  private fd: number | null = null;
+  private eventsEnd = 0;
+  private eventCount = 0;
+
   constructor(
     basePath: string = './sessions',
     model: string = '',
@@ -63,8 +82,7 @@ export class SessionTrace {
       session_id: this.sessionId,
       start_time: new Date().toISOString(),
       model,
-      system_prompt: systemPrompt,
-      events: []
+      system_prompt: systemPrompt
     };
 
     // Determine trace file path
@@ -73,27 +91,105 @@ export class SessionTrace {
     console.log(`[TRACE] Session started: ${this.sessionId}`);
     console.log(`[TRACE] Trace file: ${this.traceFile}`);
 
-    // Write initial trace file
-    this._save();
+    // Write initial trace file: header fields followed by an empty events array
+    this.header = JSON.stringify(this.trace, null, 2).replace(/\n}$/, ',\n  "events": [');
+    this._write('');
   }
 
-  private _save(): void {
+  /**
+   * Closing part of the trace file, written after the last event
+   */
+  private _tail(): string {
+    const endTime = this.trace.end_time ? `,\n  "end_time": ${JSON.stringify(this.trace.end_time)}` : '';
+    return `\n  ]${endTime}\n}\n`;
+  }
+
+  /**
+   * Write a chunk at the end of the events array, followed by the closing tail.
+   * Everything goes out in a single positioned write, keeping the file valid JSON.
+   * If the header has not been written yet (e.g. the first attempt failed), the file
+   * is recreated from the header first. Returns whether the write succeeded; on
+   * failure no offsets move, so the next write retries from the same position.
+   * Once the session is finalized the file is closed after every write, so late
+   * events (e.g. from a stream still running on a replaced manager) don't leak a descriptor.
+   */
+  private _write(chunk: string): boolean {
     try {
-      fs.writeFileSync(this.traceFile, JSON.stringify(this.trace, null, 2), 'utf-8');
+      if (this.fd === null) {
+        // Recreate the file until the header is on disk; afterwards reopen without truncating
+        this.fd = fs.openSync(this.traceFile, this.headerWritten ? 'r+' : 'w');
+      }
+
+      const body = Buffer.from(this.headerWritten ? chunk : this.header + chunk, 'utf-8');
+      const data = Buffer.concat([body, Buffer.from(this._tail(), 'utf-8')]);
+      const written = fs.writeSync(this.fd, data, 0, data.length, this.eventsEnd);
+      if (written !== data.length) {
+        this._restoreTail();
+        throw new Error(`Short write: ${written} of ${data.length} bytes`);
+      }
+
+      this.eventsEnd += body.length;
+      this.headerWritten = true;
+      return true;
     } catch (error) {
       console.error('[TRACE] Failed to save trace file:', error);
+      this._closeFile();
+      return false;
+    } finally {
+      if (this.trace.end_time) {
+        this._closeFile();
+      }
+    }
+  }
+
+  /**
+   * Roll the file back to the last good state after a partial write:
+   * the current tail at the last good offset, with anything past it truncated
+   */
+  private _restoreTail(): void {
+    if (this.fd === null) return;
+
+    try {
+      if (!this.headerWritten) {
+        // Nothing valid on disk yet; the next write recreates the file from the header
+        fs.ftruncateSync(this.fd, 0);
+        return;
+      }
+
+      const tail = Buffer.from(this._tail(), 'utf-8');
+      fs.writeSync(this.fd, tail, 0, tail.length, this.eventsEnd);
+      fs.ftruncateSync(this.fd, this.eventsEnd + tail.length);
+    } catch (error) {
+      console.error('[TRACE] Failed to restore trace file after short write:', error);
+    }
+  }
+
+  private _closeFile(): void {
+    if (this.fd !== null) {
+      try {
+        fs.closeSync(this.fd);
+      } catch (error) {
+        console.error('[TRACE] Failed to close trace file:', error);
+      }
+      this.fd = null;
     }
   }
 
-  private _addEvent(eventType: string, data: Record<string, any> = {}): void {
+  private _addEvent(
+    eventType: string,
+    data: Record<string, any> = {},
+    timestamp: string = new Date().toISOString()
+  ): void {
     const event: TraceEvent = {
-      timestamp: new Date().toISOString(),
+      timestamp,
       event_type: eventType,
       ...data
     };
 
-    this.trace.events.push(event);
-    this._save();
+    const separator = this.eventCount > 0 ? ',' : '';
+    if (this._write(`${separator}\n    ${JSON.stringify(event, null, 2).replace(/\n/g, '\n    ')}`)) {
+      this.eventCount++;
+    }
 
     console.log(`[TRACE] Event recorded: ${eventType}`);
   }
@@ -110,11 +206,14 @@ export class SessionTrace {
   }
 
   logToolCall(toolName: string, command: string, parameters: Record<string, any>): void {
+    // Share one timestamp between the trace event and the real-time event
+    const timestamp = new Date().toISOString();
+
     this._addEvent('tool_call', {
       tool_name: toolName,
       command,
       parameters
-    });
+    }, timestamp);
 
     // Emit real-time event via callback
     this.eventCallback?.({
@@ -123,7 +222,7 @@ export class SessionTrace {
         tool_name: toolName,
         command,
         parameters,
-        timestamp: new Date().toISOString()
+        timestamp
       }
     });
   }
@@ -160,28 +259,19 @@ export class SessionTrace {
     this._addEvent('llm_response', { content });
   }
 
-  logTokenUsage(
-    inputTokens: number,
-    outputTokens: number,
-    cacheReadTokens: number = 0,
-    cacheWriteTokens: number = 0,
-    totalInputTokens: number = 0,
-    totalOutputTokens: number = 0,
-    totalCacheReadTokens: number = 0,
-    totalCacheWriteTokens: number = 0
-  ): void {
+  logTokenUsage(last: TokenCounts, totals: TokenCounts): void {
     this._addEvent('token_usage', {
       last_request: {
-        input_tokens: inputTokens,
-        output_tokens: outputTokens,
-        cache_read_tokens: cacheReadTokens,
-        cache_write_tokens: cacheWriteTokens
+        input_tokens: last.input,
+        output_tokens: last.output,
+        cache_read_tokens: last.cache_read,
+        cache_write_tokens: last.cache_write
       },
       cumulative: {
-        total_input_tokens: totalInputTokens,
-        total_output_tokens: totalOutputTokens,
-        total_cache_read_tokens: totalCacheReadTokens,
-        total_cache_write_tokens: totalCacheWriteTokens
+        total_input_tokens: totals.input,
+        total_output_tokens: totals.output,
+        total_cache_read_tokens: totals.cache_read,
+        total_cache_write_tokens: totals.cache_write
       }
     });
   }
@@ -201,7 +291,8 @@ export class SessionTrace {
 
   finalize(): string {
     this.trace.end_time = new Date().toISOString();
-    this._save();
+    // Writes the end_time tail; with end_time set, _write closes the file afterwards
+    this._write('');
 
     console.log(`[TRACE] Session finalized: ${this.sessionId}`);
     return this.traceFile;
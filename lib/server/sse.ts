@@ -0,0 +1,18 @@
+/**
+ * Server-Sent Events helpers
+ * Shared encoding for the SSE response streams (chat and session events)
+ */
+
+const encoder = new TextEncoder();
+
+/**
+ * Keepalive comment, encoded once and reused for every tick
+ */
+export const SSE_KEEPALIVE = encoder.encode(': keepalive\n\n');
+
+/**
+ * Format an event as an SSE data frame and encode it to bytes
+ */
+export function encodeSseEvent(event: unknown): Uint8Array {
+  return encoder.encode(`data: ${JSON.stringify(event)}\n\n`);
+}